@@ -0,0 +1,24 @@
+"""Index documents.user_id
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-15 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Per-user duplicate checks and document counts filter on user_id
+    op.create_index(op.f('ix_documents_user_id'), 'documents', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_documents_user_id'), table_name='documents')
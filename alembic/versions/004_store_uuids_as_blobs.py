@@ -0,0 +1,69 @@
+"""Store UUID columns as 16-byte blobs on SQLite
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-15 09:30:00.000000
+
+"""
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+UUID_COLUMNS = (
+    ('users', ('id',)),
+    ('documents', ('id', 'user_id')),
+)
+
+
+def _convert_values(to_bytes: bool) -> None:
+    bind = op.get_bind()
+    for table, columns in UUID_COLUMNS:
+        for column in columns:
+            rows = bind.execute(
+                sa.text(f"SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL")
+            ).fetchall()
+            for (value,) in rows:
+                if to_bytes and isinstance(value, bytes) and len(value) == 36:
+                    # Text already cast to a blob byte-for-byte
+                    new_value = uuid.UUID(value.decode()).bytes
+                elif to_bytes and isinstance(value, str):
+                    new_value = uuid.UUID(value).bytes
+                elif not to_bytes and isinstance(value, bytes):
+                    new_value = str(uuid.UUID(bytes=value))
+                else:
+                    continue
+                bind.execute(
+                    sa.text(f"UPDATE {table} SET {column} = :new WHERE {column} = :old"),
+                    {"new": new_value, "old": value},
+                )
+
+
+def _alter_types(existing_type, new_type) -> None:
+    for table, columns in UUID_COLUMNS:
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                batch_op.alter_column(column, existing_type=existing_type, type_=new_type)
+
+
+def upgrade() -> None:
+    # PostgreSQL keeps its native UUID handling
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    # Convert before altering: the batch copy casts each value to the new
+    # type, and CAST(text AS BLOB) would keep the 36 ASCII bytes
+    _convert_values(to_bytes=True)
+    _alter_types(sa.CHAR(36), sa.LargeBinary(16))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+    _convert_values(to_bytes=False)
+    _alter_types(sa.LargeBinary(16), sa.CHAR(36))
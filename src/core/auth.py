@@ -1,6 +1,10 @@
+import hashlib
+import time
 import uuid
 from typing import Optional
 
+import jwt
+from cachetools import TTLCache
 from fastapi import Depends, Request
 from fastapi_users import BaseUserManager, FastAPIUsers, UUIDIDMixin
 from fastapi_users.authentication import (
@@ -9,7 +13,8 @@ from fastapi_users.authentication import (
     JWTStrategy,
 )
 from fastapi_users.db import SQLAlchemyUserDatabase
-from fastapi_users.exceptions import UserAlreadyExists, UserNotExists
+from fastapi_users.exceptions import InvalidID, UserAlreadyExists, UserNotExists
+from fastapi_users.jwt import decode_jwt
 
 from .database import User, get_user_db
 from .exceptions import (
@@ -27,6 +32,12 @@ logger = logging.getLogger(__name__)
 # JWT Configuration
 SECRET = os.getenv("JWT_SECRET", "your-super-secret-jwt-key-here")  # Use environment variable
 JWT_LIFETIME_SECONDS = int(os.getenv("JWT_LIFETIME_SECONDS", "3600"))  # 1 hour default
+JWT_CACHE_TTL_SECONDS = int(os.getenv("JWT_CACHE_TTL_SECONDS", "10"))
+
+# Subjects of recently verified tokens, keyed by a digest of the raw token.
+# Only tokens that passed signature and expiry checks are stored, so invalid
+# tokens are always verified again.
+_token_cache: TTLCache = TTLCache(maxsize=10_000, ttl=JWT_CACHE_TTL_SECONDS)
 
 
 class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
@@ -36,57 +47,90 @@ class UserManager(UUIDIDMixin, BaseUserManager[User, uuid.UUID]):
 
     async def on_after_register(self, user: User, request: Optional[Request] = None):
         """Called after user registration"""
-        logger.info(f"User {user.id} ({user.email}) has registered successfully.")
+        logger.info("User %s (%s) has registered successfully.", user.id, user.email)
 
     async def on_after_forgot_password(
         self, user: User, token: str, request: Optional[Request] = None
     ):
         """Called after forgot password request"""
-        logger.info(f"User {user.id} ({user.email}) has requested password reset.")
+        logger.info("User %s (%s) has requested password reset.", user.id, user.email)
 
     async def on_after_request_verify(
         self, user: User, token: str, request: Optional[Request] = None
     ):
         """Called after verification request"""
-        logger.info(f"Verification requested for user {user.id} ({user.email}).")
+        logger.info("Verification requested for user %s (%s).", user.id, user.email)
 
     async def create(self, user_create, safe: bool = False, request: Optional[Request] = None):
         """Override create method to handle custom exceptions"""
         try:
             return await super().create(user_create, safe=safe, request=request)
         except UserAlreadyExists:
-            logger.warning(f"Registration attempt with existing email: {user_create.email}")
+            logger.warning("Registration attempt with existing email: %s", user_create.email)
             raise UserAlreadyExistsError(user_create.email)
 
     async def authenticate(self, credentials):
         """Override authenticate method to handle custom exceptions"""
+        username = credentials.username
         try:
             user = await super().authenticate(credentials)
-            if user is None:
-                logger.warning(f"Authentication failed for email: {credentials.username}")
-                raise InvalidCredentialsError()
-            if not user.is_active:
-                logger.warning(f"Authentication attempt for inactive user: {credentials.username}")
-                raise InactiveUserError()
-            logger.info(f"User {user.email} authenticated successfully.")
-            return user
         except UserNotExists:
-            logger.warning(f"Authentication attempt for non-existent user: {credentials.username}")
+            logger.warning("Authentication attempt for non-existent user: %s", username)
             raise UserNotFoundError()
         except Exception as e:
-            logger.error(f"Unexpected error during authentication: {str(e)}")
+            logger.error("Unexpected error during authentication: %s", e)
             raise InvalidCredentialsError("Authentication failed due to server error")
 
+        # Raised outside the try so they are not re-wrapped as server errors
+        if user is None:
+            logger.warning("Authentication failed for email: %s", username)
+            raise InvalidCredentialsError()
+        if not user.is_active:
+            logger.warning("Authentication attempt for inactive user: %s", username)
+            raise InactiveUserError()
+        logger.info("User %s authenticated successfully.", user.email)
+        return user
+
 
 async def get_user_manager(user_db: SQLAlchemyUserDatabase = Depends(get_user_db)):
     """Get user manager instance"""
     yield UserManager(user_db)
 
 
+class CachedJWTStrategy(JWTStrategy):
+    """JWT strategy that skips signature verification for recently seen tokens"""
+
+    async def read_token(self, token: Optional[str], user_manager: BaseUserManager[User, uuid.UUID]) -> Optional[User]:
+        if token is None:
+            return None
+
+        cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+        cached = _token_cache.get(cache_key)
+        if cached is not None and cached[1] > time.time():
+            user_id = cached[0]
+        else:
+            try:
+                data = decode_jwt(
+                    token, self.decode_key, self.token_audience, algorithms=[self.algorithm]
+                )
+            except jwt.PyJWTError:
+                return None
+            user_id = data.get("sub")
+            if user_id is None:
+                return None
+            _token_cache[cache_key] = (user_id, data.get("exp", float("inf")))
+
+        try:
+            parsed_id = user_manager.parse_id(user_id)
+            return await user_manager.get(parsed_id)
+        except (UserNotExists, InvalidID):
+            return None
+
+
 # JWT Authentication Strategy
 def get_jwt_strategy() -> JWTStrategy:
     """Get JWT strategy for authentication"""
-    return JWTStrategy(secret=SECRET, lifetime_seconds=JWT_LIFETIME_SECONDS)
+    return CachedJWTStrategy(secret=SECRET, lifetime_seconds=JWT_LIFETIME_SECONDS)
 
 
 # Bearer Transport (for JWT tokens in Authorization header)
@@ -1,53 +1,67 @@
+import os
 import uuid
+import weakref
 from datetime import datetime
-from typing import AsyncGenerator
+from typing import AsyncGenerator, Optional
 
+from cachetools import TTLCache
 from fastapi import Depends
 from fastapi_users.db import SQLAlchemyBaseUserTableUUID, SQLAlchemyUserDatabase
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Boolean, event, inspect
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import DeclarativeMeta, declarative_base
-from sqlalchemy.orm import relationship
-from sqlalchemy.types import TypeDecorator, CHAR
+from sqlalchemy.orm import make_transient_to_detached, relationship
+from sqlalchemy.types import TypeDecorator, CHAR, LargeBinary
 from sqlalchemy import String as SQLString
 
 DATABASE_URL = "sqlite+aiosqlite:///./knowledge_assistant.db"
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+USER_CACHE_TTL_SECONDS = int(os.getenv("USER_CACHE_TTL_SECONDS", "5"))
 
 Base: DeclarativeMeta = declarative_base()
 
+# Dialects of engines whose SQLite database still stores GUIDs as CHAR(36)
+_text_guid_dialects: "weakref.WeakSet" = weakref.WeakSet()
+
 
 class GUID(TypeDecorator):
     """Platform-independent GUID type.
-    Uses PostgreSQL's UUID type, otherwise uses CHAR(36), storing as stringified hex values.
+    Uses PostgreSQL's UUID type, otherwise uses a 16-byte BLOB holding the raw UUID bytes.
+    SQLite databases created before migration 004 keep their CHAR(36) columns;
+    detect_guid_storage switches their engine back to the string form.
     """
-    impl = CHAR
+    impl = LargeBinary
     cache_ok = True
 
     def load_dialect_impl(self, dialect):
         if dialect.name == 'postgresql':
             return dialect.type_descriptor(UUID(as_uuid=True))
-        else:
+        elif dialect in _text_guid_dialects:
             return dialect.type_descriptor(CHAR(36))
+        else:
+            return dialect.type_descriptor(LargeBinary(16))
 
     def process_bind_param(self, value, dialect):
         if value is None:
             return value
-        elif dialect.name == 'postgresql':
+        if dialect.name == 'postgresql':
             return str(value)
-        else:
-            if not isinstance(value, uuid.UUID):
-                return str(uuid.UUID(value))
-            else:
-                return str(value)
+        if not isinstance(value, uuid.UUID):
+            value = uuid.UUID(value)
+        # SQLite never compares a BLOB equal to TEXT, so bind in the stored form
+        if dialect in _text_guid_dialects:
+            return str(value)
+        return value.bytes
 
     def process_result_value(self, value, dialect):
-        if value is None:
-            return value
-        else:
-            if not isinstance(value, uuid.UUID):
-                return uuid.UUID(value)
+        if value is None or isinstance(value, uuid.UUID):
             return value
+        if isinstance(value, bytes):
+            return uuid.UUID(bytes=value)
+        # Rows written before the BLOB migration hold the 36-char string form
+        return uuid.UUID(value)
 
 
 class User(SQLAlchemyBaseUserTableUUID, Base):
@@ -67,7 +81,7 @@ class DocumentMetadata(Base):
     __tablename__ = "documents"
     
     id = Column(GUID(), primary_key=True, default=uuid.uuid4)
-    user_id = Column(GUID(), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(GUID(), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     filename = Column(String(255), nullable=False)
     original_size = Column(Integer)
     chunks_count = Column(Integer)
@@ -83,13 +97,62 @@ User.documents = relationship("DocumentMetadata", back_populates="user", cascade
 
 
 # Database engine and session configuration
-engine = create_async_engine(DATABASE_URL)
+# The aiosqlite dialect pools connections for file databases, so sessions
+# reuse an open connection instead of reconnecting per request.
+engine = create_async_engine(
+    DATABASE_URL,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+    pool_recycle=3600,
+)
 async_session_maker = async_sessionmaker(engine, expire_on_commit=False)
 
+# WAL lets readers proceed during writes, and NORMAL sync is durable under WAL
+# while avoiding an fsync per commit. cache_size is in KiB when negative.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLite tuning PRAGMAs to every new pooled connection"""
+    if engine.dialect.name != "sqlite":
+        return
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
+
+def detect_guid_storage(connection) -> None:
+    """Match GUID binding to how an existing SQLite database stores UUIDs.
+
+    Databases created before migration 004 hold 36-char text ids; binding
+    blobs against them would miss every row, so they keep the string form
+    until migrated. Must run before the engine first uses GUID, since the
+    dialect caches the chosen column type.
+    """
+    if connection.dialect.name != "sqlite":
+        return
+    inspector = inspect(connection)
+    if not inspector.has_table("users"):
+        return
+    id_type = next(col["type"] for col in inspector.get_columns("users") if col["name"] == "id")
+    if isinstance(id_type, LargeBinary):
+        _text_guid_dialects.discard(connection.dialect)
+    else:
+        _text_guid_dialects.add(connection.dialect)
+
 
 async def create_db_and_tables():
     """Create database tables"""
     async with engine.begin() as conn:
+        await conn.run_sync(detect_guid_storage)
         await conn.run_sync(Base.metadata.create_all)
 
 
@@ -99,6 +162,42 @@ async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+# Users by id, shared across requests. Entries are short-lived and dropped on
+# update/delete so account changes (e.g. deactivation) are picked up quickly.
+# Each entry holds plain column values, never an instance bound to the session
+# that loaded it, so a rollback in that session cannot expire the cached copy.
+_user_cache: TTLCache = TTLCache(maxsize=1000, ttl=USER_CACHE_TTL_SECONDS)
+
+
+def _user_snapshot(user: User) -> dict:
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+
+class CachedUserDatabase(SQLAlchemyUserDatabase):
+    """User database adapter that caches lookups by id"""
+
+    async def get(self, id: uuid.UUID) -> Optional[User]:
+        snapshot = _user_cache.get(id)
+        if snapshot is not None:
+            # Rebuild the user as if loaded and attach it to this request's
+            # session without hitting the database
+            user = User(**snapshot)
+            make_transient_to_detached(user)
+            return await self.session.merge(user, load=False)
+        user = await super().get(id)
+        if user is not None:
+            _user_cache[id] = _user_snapshot(user)
+        return user
+
+    async def update(self, user: User, update_dict: dict) -> User:
+        _user_cache.pop(user.id, None)
+        return await super().update(user, update_dict)
+
+    async def delete(self, user: User) -> None:
+        _user_cache.pop(user.id, None)
+        await super().delete(user)
+
+
 async def get_user_db(session: AsyncSession = Depends(get_async_session)):
     """Get user database instance for FastAPI-Users"""
-    yield SQLAlchemyUserDatabase(session, User)
\ No newline at end of file
+    yield CachedUserDatabase(session, User)
\ No newline at end of file
@@ -6,6 +6,13 @@ from typing import Optional, Any, Dict
 import datetime
 
 
+def _rebuild_exception(cls, state: Dict[str, Any]):
+    """Recreate a pickled exception without re-running its __init__."""
+    exc = cls.__new__(cls)
+    exc.__dict__.update(state)
+    return exc
+
+
 class KnowledgeAssistantException(HTTPException):
     """Base exception class for Knowledge Assistant errors."""
     
@@ -18,7 +25,20 @@ class KnowledgeAssistantException(HTTPException):
     ):
         super().__init__(status_code=status_code, detail=detail, headers=headers)
         self.error_type = error_type
-        self.timestamp = datetime.datetime.utcnow().isoformat()
+        self._timestamp: Optional[str] = None
+
+    @property
+    def timestamp(self) -> str:
+        """UTC time in ISO format, computed when first read by a handler."""
+        if self._timestamp is None:
+            self._timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
+        return self._timestamp
+
+    def __reduce__(self):
+        # Subclass __init__ signatures differ and HTTPException needs status_code,
+        # so restore from instance state. The traceback is not carried over,
+        # which also makes copy.copy() a frame-free clone.
+        return (_rebuild_exception, (self.__class__, self.__dict__.copy()))
 
 
 class FileProcessingError(KnowledgeAssistantException):
@@ -38,11 +58,16 @@ class FileProcessingError(KnowledgeAssistantException):
 class InvalidFileTypeError(KnowledgeAssistantException):
     """Raised when an unsupported file type is uploaded."""
     
+    DEFAULT_SUPPORTED_TYPES = (".pdf", ".txt", ".docx")
+    _DEFAULT_SUPPORTED = ", ".join(DEFAULT_SUPPORTED_TYPES)
+    
     def __init__(self, file_extension: str, supported_types: list = None):
         if supported_types is None:
-            supported_types = [".pdf", ".txt", ".docx"]
+            supported = self._DEFAULT_SUPPORTED
+        else:
+            supported = ", ".join(supported_types)
         
-        detail = f"Invalid file type '{file_extension}'. Supported types: {', '.join(supported_types)}"
+        detail = f"Invalid file type '{file_extension}'. Supported types: {supported}"
         super().__init__(
             status_code=400,
             detail=detail,
@@ -1,38 +1,46 @@
+import httpx
 import ollama
 import os
 
 # --- Ollama Client Initialization ---
 
 def get_ollama_client():
-    """Initializes and returns the Ollama client."""
+    """Initializes and returns the async Ollama client."""
     host = os.environ.get("OLLAMA_HOST", "http://localhost:11434")
-    return ollama.Client(host=host)
+    # Keep connections alive between queries; generation itself can be slow,
+    # so only connecting gets a short timeout
+    return ollama.AsyncClient(
+        host=host,
+        timeout=httpx.Timeout(300.0, connect=10.0),
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=40, keepalive_expiry=30.0),
+    )
 
 # --- Prompt Generation ---
 
-def format_prompt(query: str, context: list[dict]) -> str:
-    """Formats the prompt for the LLM with the retrieved context."""
-    context_str = "\n".join([item.payload.get('text') for item in context])
-    prompt = f"""**Instruction**:
+PROMPT_TEMPLATE = """**Instruction**:
 Answer the user's query based *only* on the provided context.
 If the context does not contain the answer, state that you cannot answer the question with the given information.
 Do not use any prior knowledge.
 
 **Context**:
-{context_str}
+%s
 
 **Query**:
-{query}
+%s
 
 **Answer**:
 """
-    return prompt
+
+def format_prompt(query: str, context: list[dict]) -> str:
+    """Formats the prompt for the LLM with the retrieved context."""
+    context_str = "\n".join(item.payload["text"] for item in context)
+    return PROMPT_TEMPLATE % (context_str, query)
 
 # --- LLM Interaction ---
 
-def generate_response(client: ollama.Client, model: str, prompt: str):
-    """Generates a response from the LLM."""
-    response = client.chat(
+async def generate_response(client: ollama.AsyncClient, model: str, prompt: str):
+    """Generates a response from the LLM without blocking the event loop."""
+    response = await client.chat(
         model=model,
         messages=[{"role": "user", "content": prompt}]
     )
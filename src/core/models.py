@@ -1,21 +1,23 @@
-from pydantic import BaseModel, Field, validator
-from typing import List, Dict, Any, Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import List, Optional
 
 class QueryRequest(BaseModel):
+    # Stripping happens in pydantic-core before the length checks, so
+    # whitespace-only queries fail min_length without a Python validator
+    model_config = ConfigDict(str_strip_whitespace=True)
+
     query: str = Field(..., min_length=1, max_length=1000, description="The query text to search for")
-    
-    @validator('query')
-    def validate_query(cls, v):
-        if not v.strip():
-            raise ValueError('Query cannot be empty or contain only whitespace')
-        return v.strip()
 
 class SourceDocument(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     source: str
     text: str
     score: float
 
 class QueryResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     answer: str
     source_documents: List[SourceDocument]
 
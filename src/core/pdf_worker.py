@@ -0,0 +1,19 @@
+"""
+PDF text extraction that runs inside the extraction worker processes.
+
+Kept apart from processing.py so that workers import only PyMuPDF, not the
+embedding and text-splitting libraries.
+"""
+import fitz  # PyMuPDF
+
+
+def page_text(doc, start: int, stop: int) -> str:
+    """Returns the text of pages [start, stop) of an open document."""
+    # Collect pages and join once; repeated += copies the text for every page
+    return "".join(doc[i].get_text("text", sort=False) for i in range(start, stop))
+
+
+def extract_page_range(file_path: str, start: int, stop: int) -> str:
+    """Extracts the text of pages [start, stop) from a PDF file."""
+    with fitz.open(file_path) as doc:
+        return page_text(doc, start, stop)
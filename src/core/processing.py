@@ -1,51 +1,158 @@
+import functools
+import io
+import mmap
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
 import fitz  # PyMuPDF
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from sentence_transformers import SentenceTransformer
 import docx # Added for docx parsing
+from .pdf_worker import extract_page_range, page_text
 
-def parse_pdf(file_path: str) -> str:
-    """Extracts text from a PDF file."""
-    doc = fitz.open(file_path)
-    text = ""
-    for page in doc:
-        text += page.get_text()
-    doc.close()
-    return text
+EMBED_BATCH_SIZE = int(os.getenv("EMBED_BATCH_SIZE", "64"))
+# CPU threads for torch inference; unset keeps torch's default
+TORCH_NUM_THREADS = os.getenv("TORCH_NUM_THREADS")
+# PDFs are extracted in parallel with one worker per PDF_PARALLEL_MIN_PAGES pages
+PDF_PARALLEL_MIN_PAGES = 20
+PDF_MAX_WORKERS = min(os.cpu_count() or 1, 6)
+# "onnx" serves the int8-quantized ONNX export through ONNX Runtime
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+ONNX_MODEL_FILE = os.getenv("ONNX_MODEL_FILE", "onnx/model_qint8_avx512_vnni.onnx")
+
+def _open_pdf(file_path: Optional[str], stream: Optional[bytes] = None):
+    if stream is not None:
+        return fitz.open(stream=stream, filetype="pdf")
+    return fitz.open(file_path)
+
+_pdf_pool: Optional[ProcessPoolExecutor] = None
+_pdf_pool_lock = threading.Lock()
+
+def _get_pdf_pool() -> ProcessPoolExecutor:
+    # One pool shared by all uploads bounds the number of extraction processes.
+    # Workers come from a forkserver rather than forking the threaded server,
+    # and the forkserver preloads only the PyMuPDF worker module.
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload([extract_page_range.__module__])
+            _pdf_pool = ProcessPoolExecutor(max_workers=PDF_MAX_WORKERS, mp_context=context)
+        return _pdf_pool
+
+def shutdown_pdf_pool() -> None:
+    """Stops the PDF extraction worker processes, if any were started."""
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is not None:
+            _pdf_pool.shutdown(cancel_futures=True)
+            _pdf_pool = None
+
+def parse_pdf(file_path: Optional[str], stream: Optional[bytes] = None) -> str:
+    """Extracts text from a PDF file, or from its bytes when stream is given."""
+    with _open_pdf(file_path, stream) as doc:
+        page_count = len(doc)
+        workers = min(PDF_MAX_WORKERS, page_count // PDF_PARALLEL_MIN_PAGES)
+        if workers < 2:
+            return page_text(doc, 0, page_count)
+
+    # PyMuPDF is not thread-safe, so large documents are split into page
+    # ranges that separate processes extract; shards are joined in page order.
+    # In-memory uploads are written to disk once so workers open the file
+    # instead of each receiving a pickled copy of the bytes.
+    bounds = [page_count * i // workers for i in range(workers + 1)]
+    temp_path = None
+    try:
+        if stream is not None:
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
+                tmp.write(stream)
+                temp_path = file_path = tmp.name
+        shards = _get_pdf_pool().map(
+            extract_page_range, [file_path] * workers, bounds[:-1], bounds[1:]
+        )
+        return "".join(shards)
+    finally:
+        if temp_path is not None:
+            os.unlink(temp_path)
 
-def parse_txt(file_path: str) -> str:
-    """Extracts text from a TXT file."""
-    with open(file_path, 'r', encoding='utf-8') as f:
-        text = f.read()
+def _normalize_newlines(text: str) -> str:
+    # Match the newline translation of text-mode reads
+    if '\r' in text:
+        text = text.replace('\r\n', '\n').replace('\r', '\n')
     return text
 
-def parse_docx(file_path: str) -> str:
-    """Extracts text from a DOCX file."""
-    document = docx.Document(file_path)
-    text = []
-    for paragraph in document.paragraphs:
-        text.append(paragraph.text)
-    return '\n'.join(text)
+def parse_txt(file_path: Optional[str], stream: Optional[bytes] = None) -> str:
+    """Extracts text from a TXT file, or from its bytes when stream is given."""
+    if stream is not None:
+        return _normalize_newlines(stream.decode('utf-8'))
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ""
+        # Decode straight from the mapped pages instead of reading into a bytes copy
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            with memoryview(mm) as view:
+                text = str(view, 'utf-8')
+    return _normalize_newlines(text)
 
-def parse_document(file_path: str, file_extension: str) -> str:
-    """Dispatches to the correct parser based on file extension."""
+def parse_docx(file_path: Optional[str], stream: Optional[bytes] = None) -> str:
+    """Extracts text from a DOCX file, or from its bytes when stream is given."""
+    document = docx.Document(io.BytesIO(stream) if stream is not None else file_path)
+    return '\n'.join(paragraph.text for paragraph in document.paragraphs)
+
+def parse_document(file_path: Optional[str], file_extension: str, stream: Optional[bytes] = None) -> str:
+    """Dispatches to the correct parser based on file extension.
+
+    Pass the file's bytes as stream to parse an upload held in memory; the
+    path is ignored in that case.
+    """
     if file_extension == ".pdf":
-        return parse_pdf(file_path)
+        return parse_pdf(file_path, stream)
     elif file_extension == ".txt":
-        return parse_txt(file_path)
+        return parse_txt(file_path, stream)
     elif file_extension == ".docx":
-        return parse_docx(file_path)
+        return parse_docx(file_path, stream)
     else:
         raise ValueError(f"Unsupported file type: {file_extension}")
 
-def chunk_text(text: str) -> list[str]:
-    """Splits text into smaller chunks."""
-    text_splitter = RecursiveCharacterTextSplitter(
-        chunk_size=1000,
-        chunk_overlap=200,
+@functools.lru_cache(maxsize=8)
+def _text_splitter(chunk_size: int, chunk_overlap: int) -> RecursiveCharacterTextSplitter:
+    # Splitters hold no per-call state, so one instance per size is reused
+    return RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
         length_function=len
     )
-    return text_splitter.split_text(text)
 
+def chunk_text(text: str, chunk_size: int = 1000, chunk_overlap: int = 200) -> list[str]:
+    """Splits text into smaller chunks."""
+    return _text_splitter(chunk_size, chunk_overlap).split_text(text)
+
+@functools.lru_cache(maxsize=None)
 def get_embedding_model(model_name: str = 'all-MiniLM-L6-v2'):
-    """Loads the sentence-transformer model."""
-    return SentenceTransformer(model_name)
\ No newline at end of file
+    """Loads the sentence-transformer model (once per model name)."""
+    if TORCH_NUM_THREADS:
+        import torch
+        torch.set_num_threads(int(TORCH_NUM_THREADS))
+    if EMBEDDING_BACKEND == "onnx":
+        return SentenceTransformer(
+            model_name,
+            backend="onnx",
+            model_kwargs={"file_name": ONNX_MODEL_FILE},
+        )
+    # SentenceTransformer picks CUDA when available; run it in fp16 there
+    model = SentenceTransformer(model_name)
+    if model.device.type == "cuda":
+        model.half()
+    return model
+
+def encode_texts(model, texts: list[str], batch_size: int = EMBED_BATCH_SIZE):
+    """Encodes texts in batched forward passes, returning a NumPy array."""
+    return model.encode(
+        texts,
+        batch_size=batch_size,
+        show_progress_bar=False,
+        convert_to_numpy=True,
+    )
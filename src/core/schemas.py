@@ -1,7 +1,7 @@
 import uuid
 from typing import Optional
 from fastapi_users import schemas
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, ConfigDict, EmailStr
 from datetime import datetime
 
 
@@ -32,8 +32,7 @@ class DocumentMetadataRead(BaseModel):
     upload_date: datetime
     file_hash: Optional[str]
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class DocumentMetadataCreate(BaseModel):
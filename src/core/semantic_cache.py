@@ -0,0 +1,83 @@
+"""
+Per-user cache of recent query answers, matched by query embedding similarity.
+"""
+import os
+import time
+import uuid
+from typing import Any, Optional
+
+import numpy as np
+from cachetools import LRUCache
+
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.95"))
+SEMANTIC_CACHE_TTL_SECONDS = float(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "300"))
+SEMANTIC_CACHE_ENTRIES = int(os.getenv("SEMANTIC_CACHE_ENTRIES", "64"))
+
+
+def _normalize(vector) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+class SemanticCache:
+    """Answers to recent queries, looked up by cosine similarity.
+
+    Unit-length query embeddings live in one preallocated matrix, so a lookup
+    is a single matrix-vector product. When full, the oldest entry is replaced.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = SEMANTIC_CACHE_ENTRIES,
+        threshold: float = SEMANTIC_CACHE_THRESHOLD,
+        ttl_seconds: float = SEMANTIC_CACHE_TTL_SECONDS
+    ):
+        self.max_entries = max_entries
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self._vectors: Optional[np.ndarray] = None  # allocated on first put
+        self._values: list = [None] * max_entries
+        self._expires = np.zeros(max_entries, dtype=np.float64)  # monotonic deadline per row
+        self._next = 0
+        self._size = 0
+
+    def get(self, vector) -> Optional[Any]:
+        """Return the value cached for the most similar query, if close enough."""
+        if self._size == 0:
+            return None
+        scores = self._vectors[:self._size] @ _normalize(vector)
+        # Expired rows must not shadow a live match that scores slightly lower
+        scores[self._expires[:self._size] <= time.monotonic()] = -np.inf
+        best = int(np.argmax(scores))
+        if scores[best] >= self.threshold:
+            return self._values[best]
+        return None
+
+    def put(self, vector, value: Any) -> None:
+        """Cache value for the query embedded as vector."""
+        unit = _normalize(vector)
+        if self._vectors is None:
+            self._vectors = np.zeros((self.max_entries, unit.shape[0]), dtype=np.float32)
+        self._vectors[self._next] = unit
+        self._values[self._next] = value
+        self._expires[self._next] = time.monotonic() + self.ttl_seconds
+        self._next = (self._next + 1) % self.max_entries
+        self._size = min(self._size + 1, self.max_entries)
+
+
+# Caches for the most recently active users; answers never cross users
+_user_caches: LRUCache = LRUCache(maxsize=256)
+
+
+def get_user_cache(user_id: uuid.UUID) -> SemanticCache:
+    """Return the answer cache for a user, creating it on first use."""
+    cache = _user_caches.get(user_id)
+    if cache is None:
+        cache = _user_caches[user_id] = SemanticCache()
+    return cache
+
+
+def invalidate_user_cache(user_id: uuid.UUID) -> None:
+    """Drop a user's cached answers, e.g. after their knowledge base changes."""
+    _user_caches.pop(user_id, None)
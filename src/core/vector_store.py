@@ -1,17 +1,47 @@
+import grpc
+import httpx
+import numpy as np
 from qdrant_client import QdrantClient, models
+from qdrant_client.http.exceptions import UnexpectedResponse
+import functools
+import hashlib
 import os
 import uuid
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Points per upsert request; keeps request frames small for large documents
+UPSERT_BATCH_SIZE = 128
+
+# int8 copies of the vectors kept in RAM for scoring; searches rescore the
+# oversampled candidates against the original vectors to preserve recall
+QUANTIZATION_CONFIG = models.ScalarQuantization(
+    scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, always_ram=True)
+)
+SEARCH_PARAMS = models.SearchParams(
+    quantization=models.QuantizationSearchParams(rescore=True, oversampling=2.0)
+)
+
 # --- Qdrant Client Initialization ---
 
+@functools.lru_cache(maxsize=None)
 def get_qdrant_client():
-    """Initializes and returns the Qdrant client."""
+    """Initializes and returns the Qdrant client (shared by all callers)."""
     # Get Qdrant host from environment variable, default to localhost if not set
     host = os.environ.get("QDRANT_HOST", "localhost")
-    client = QdrantClient(host=host, port=6333)
+    # gRPC is considerably faster than REST for bulk upserts and searches
+    prefer_grpc = os.environ.get("QDRANT_PREFER_GRPC", "true").lower() == "true"
+    client = QdrantClient(
+        host=host,
+        port=6333,
+        grpc_port=6334,
+        prefer_grpc=prefer_grpc,
+        timeout=60,
+        # Keep connections warm between requests on both transports
+        grpc_options={"grpc.keepalive_time_ms": 30000},
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+    )
     return client
 
 # --- Collection Management ---
@@ -25,11 +55,13 @@ def create_collection_if_not_exists(client: QdrantClient, collection_name: str,
         client.create_collection(
             collection_name=collection_name,
             vectors_config=models.VectorParams(size=vector_size, distance=models.Distance.COSINE),
+            quantization_config=QUANTIZATION_CONFIG,
         )
         logger.info(f"Created new collection '{collection_name}'")
 
 # --- User-Specific Collection Management ---
 
+@functools.lru_cache(maxsize=4096)
 def get_user_collection_name(user_id: uuid.UUID) -> str:
     """
     Generate a user-specific collection name.
@@ -68,6 +100,13 @@ def ensure_user_collection_exists(client: QdrantClient, user_id: uuid.UUID, vect
             client.create_collection(
                 collection_name=collection_name,
                 vectors_config=models.VectorParams(size=vector_size, distance=models.Distance.COSINE),
+                quantization_config=QUANTIZATION_CONFIG,
+            )
+            # Index chunk hashes so duplicate lookups on upload avoid a full scan
+            client.create_payload_index(
+                collection_name=collection_name,
+                field_name="hash",
+                field_schema=models.PayloadSchemaType.KEYWORD
             )
             logger.info(f"Created new user collection '{collection_name}' for user {user_id}")
         except Exception as e:
@@ -95,17 +134,87 @@ def collection_exists(client: QdrantClient, collection_name: str) -> bool:
 
 # --- Vector Operations ---
 
-def upsert_vectors(client: QdrantClient, collection_name: str, vectors, payloads):
-    """Upserts vectors and their payloads into the specified collection."""
-    client.upsert(
-        collection_name=collection_name,
-        points=models.Batch(
-            ids=list(range(len(vectors))),  # Generate sequential integer IDs
-            vectors=vectors,
-            payloads=payloads
-        ),
-        wait=True
+def chunk_hash(text: str) -> str:
+    """Content hash of a chunk's text, stored in its payload for deduplication."""
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+def make_point_id(source: str, index: int, content_hash: str) -> str:
+    """
+    Derive a deterministic point ID for a document chunk.
+    
+    The same chunk of the same file always maps to the same ID, so re-uploads
+    overwrite their own points instead of colliding with other documents.
+    """
+    return str(uuid.uuid5(uuid.NAMESPACE_OID, f"{source}:{index}:{content_hash}"))
+
+def find_existing_hashes(client: QdrantClient, collection_name: str, hashes: list[str]) -> set[str]:
+    """
+    Look up which chunk hashes are already stored in a collection.
+    
+    Args:
+        client: Qdrant client instance
+        collection_name: Name of the collection to check
+        hashes: Content hashes from chunk_hash
+        
+    Returns:
+        The subset of hashes that some stored point carries in its payload
+    """
+    if not hashes:
+        return set()
+    wanted = list(set(hashes))
+    scroll_filter = models.Filter(
+        must=[models.FieldCondition(key="hash", match=models.MatchAny(any=wanted))]
     )
+    # Several stored points can share a hash, so a single page may not cover
+    # every match; follow the scroll offset until the filter is exhausted
+    found = set()
+    offset = None
+    while True:
+        points, offset = client.scroll(
+            collection_name=collection_name,
+            scroll_filter=scroll_filter,
+            limit=len(wanted),
+            offset=offset,
+            with_payload=["hash"],
+            with_vectors=False
+        )
+        found.update(point.payload["hash"] for point in points if point.payload)
+        if offset is None or len(found) == len(wanted):
+            return found
+
+def upsert_vectors(client: QdrantClient, collection_name: str, vectors, payloads, ids=None, wait: bool = False):
+    """Upserts vectors and their payloads into the specified collection.
+
+    Points are sent in requests of UPSERT_BATCH_SIZE. By default the call
+    returns once Qdrant has accepted the update. Updates to a collection are
+    applied in order, so callers that need to read their writes only have to
+    pass wait=True on the last batch.
+    """
+    if ids is None:
+        ids = [str(uuid.uuid4()) for _ in range(len(vectors))]
+    # One float32 array (fp16 on GPU hosts, lists from other callers) that each
+    # request converts with a single tolist() instead of per-vector coercion
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    total = len(vectors)
+    for start in range(0, total, UPSERT_BATCH_SIZE):
+        stop = start + UPSERT_BATCH_SIZE
+        client.upsert(
+            collection_name=collection_name,
+            points=models.Batch(
+                ids=list(ids[start:stop]),
+                vectors=vectors[start:stop].tolist(),
+                payloads=payloads[start:stop]
+            ),
+            wait=wait and stop >= total
+        )
+
+def _is_not_found(error: Exception) -> bool:
+    """Whether a client error means the collection does not exist (REST or gRPC)."""
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code == 404
+    if isinstance(error, grpc.RpcError):
+        return error.code() == grpc.StatusCode.NOT_FOUND
+    return False
 
 def search_vectors(client: QdrantClient, collection_name: str, query_vector, limit: int = 5):
     """
@@ -121,30 +230,24 @@ def search_vectors(client: QdrantClient, collection_name: str, query_vector, lim
         Search results, or empty list if collection doesn't exist or is empty
     """
     try:
-        # Check if collection exists first
-        if not collection_exists(client, collection_name):
-            logger.warning(f"Collection '{collection_name}' does not exist")
-            return []
-        
-        # Check if collection has any points
-        collection_info = client.get_collection(collection_name)
-        if collection_info.points_count == 0:
-            logger.info(f"Collection '{collection_name}' is empty")
-            return []
-        
-        # Perform the search
+        # A single round trip: a missing collection is reported as not-found
+        # and an empty one simply yields no hits
         results = client.search(
             collection_name=collection_name,
             query_vector=query_vector,
             limit=limit,
-            with_payload=True
+            with_payload=True,
+            search_params=SEARCH_PARAMS
         )
         
         logger.info(f"Found {len(results)} results in collection '{collection_name}'")
         return results
         
     except Exception as e:
-        logger.error(f"Error searching collection '{collection_name}': {str(e)}")
+        if _is_not_found(e):
+            logger.warning(f"Collection '{collection_name}' does not exist")
+        else:
+            logger.error(f"Error searching collection '{collection_name}': {str(e)}")
         return []
 
 def get_collection_info(client: QdrantClient, collection_name: str) -> dict:
@@ -144,11 +144,11 @@ def invalid_login_data():
 @pytest.fixture
 async def test_user(db_session: AsyncSession):
     """Create a test user in the database."""
-    from src.core.database import get_user_db
-    from src.core.auth import get_user_manager
+    from src.core.database import CachedUserDatabase, User
+    from src.core.auth import UserManager
     
-    user_db = get_user_db.__wrapped__(db_session)
-    user_manager = get_user_manager.__wrapped__(user_db)
+    user_db = CachedUserDatabase(db_session, User)
+    user_manager = UserManager(user_db)
     
     user_create = UserCreate(
         email="test@example.com",
@@ -163,11 +163,11 @@ async def test_user(db_session: AsyncSession):
 @pytest.fixture
 async def inactive_test_user(db_session: AsyncSession):
     """Create an inactive test user in the database."""
-    from src.core.database import get_user_db
-    from src.core.auth import get_user_manager
+    from src.core.database import CachedUserDatabase, User
+    from src.core.auth import UserManager
     
-    user_db = get_user_db.__wrapped__(db_session)
-    user_manager = get_user_manager.__wrapped__(user_db)
+    user_db = CachedUserDatabase(db_session, User)
+    user_manager = UserManager(user_db)
     
     user_create = UserCreate(
         email="inactive@example.com",
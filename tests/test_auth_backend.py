@@ -212,7 +212,27 @@ class TestJWTTokenValidation:
         data = response.json()
         assert data["email"] == test_user.email
         assert data["id"] == str(test_user.id)
-    
+
+    async def test_repeated_token_access_uses_cache(self, async_client: AsyncClient, test_user):
+        """Test that a verified token is cached and keeps resolving the same user."""
+        login_data = {
+            "username": test_user.email,
+            "password": "SecurePassword123!"
+        }
+
+        login_response = await async_client.post("/auth/jwt/login", data=login_data)
+        token = login_response.json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        first = await async_client.get("/users/me", headers=headers)
+        with patch("src.core.auth.decode_jwt") as mock_decode:
+            second = await async_client.get("/users/me", headers=headers)
+            mock_decode.assert_not_called()
+
+        assert first.status_code == status.HTTP_200_OK
+        assert second.status_code == status.HTTP_200_OK
+        assert second.json()["id"] == str(test_user.id)
+
     async def test_invalid_token_format(self, async_client: AsyncClient):
         """Test access with malformed JWT token."""
         invalid_tokens = [
@@ -0,0 +1,136 @@
+"""
+Database layer tests: GUID storage, id lookups and the cached user adapter.
+"""
+import uuid
+
+from fastapi import status
+from httpx import AsyncClient
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from src.core.database import CachedUserDatabase, User, _user_cache, detect_guid_storage
+from tests.conftest import TestingSessionLocal, test_engine
+
+
+class TestGUIDStorage:
+    """Test that UUID primary keys round-trip and can be queried by id."""
+
+    async def test_uuid_round_trips_and_queries_by_id(self, db_session: AsyncSession):
+        """Test that a GUID written as a blob is found by UUID and by string."""
+        user_id = uuid.uuid4()
+        db_session.add(User(id=user_id, email="guid@example.com", hashed_password="hashed"))
+        await db_session.commit()
+        db_session.expunge_all()
+
+        result = await db_session.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one()
+        assert isinstance(user.id, uuid.UUID)
+        assert user.id == user_id
+
+        db_session.expunge_all()
+        result = await db_session.execute(select(User).where(User.id == str(user_id)))
+        assert result.scalar_one().id == user_id
+
+    async def test_legacy_text_ids_are_still_found(self):
+        """Test that databases still storing CHAR(36) ids keep resolving lookups."""
+        engine = create_async_engine(
+            "sqlite+aiosqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        user_id = uuid.uuid4()
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text(
+                    "CREATE TABLE users ("
+                    "id CHAR(36) PRIMARY KEY, email VARCHAR(320) NOT NULL, "
+                    "hashed_password VARCHAR(1024) NOT NULL, is_active BOOLEAN NOT NULL, "
+                    "is_superuser BOOLEAN NOT NULL, is_verified BOOLEAN NOT NULL, "
+                    "created_at DATETIME, updated_at DATETIME)"
+                ))
+                await conn.execute(
+                    text(
+                        "INSERT INTO users (id, email, hashed_password, is_active, is_superuser, is_verified) "
+                        "VALUES (:id, 'legacy@example.com', 'hashed', 1, 0, 0)"
+                    ),
+                    {"id": str(user_id)},
+                )
+                await conn.run_sync(detect_guid_storage)
+
+            async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+                user = await session.get(User, user_id)
+                assert user is not None
+                assert user.email == "legacy@example.com"
+
+                # New rows keep the stored form so the column stays uniform
+                new_id = uuid.uuid4()
+                session.add(User(id=new_id, email="new@example.com", hashed_password="hashed"))
+                await session.commit()
+                result = await session.execute(
+                    text("SELECT typeof(id) FROM users WHERE id = :id"), {"id": str(new_id)}
+                )
+                assert result.scalar_one() == "text"
+        finally:
+            await engine.dispose()
+
+
+class TestCachedUserDatabase:
+    """Test that user lookups are cached and evicted on account changes."""
+
+    async def _login(self, async_client: AsyncClient, user) -> dict:
+        login_data = {
+            "username": user.email,
+            "password": "SecurePassword123!"
+        }
+        response = await async_client.post("/auth/jwt/login", data=login_data)
+        return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    async def test_cache_hit_issues_no_select(self, async_client: AsyncClient, test_user):
+        """Test that a second authenticated request does not query the users table."""
+        headers = await self._login(async_client, test_user)
+        first = await async_client.get("/users/me", headers=headers)
+        assert first.status_code == status.HTTP_200_OK
+        assert test_user.id in _user_cache
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(test_engine.sync_engine, "before_cursor_execute", record)
+        try:
+            second = await async_client.get("/users/me", headers=headers)
+        finally:
+            event.remove(test_engine.sync_engine, "before_cursor_execute", record)
+
+        assert second.status_code == status.HTTP_200_OK
+        assert second.json()["id"] == str(test_user.id)
+        assert not [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+
+    async def test_cached_user_survives_rollback_of_loading_session(self, test_db, test_user):
+        """Test that a rollback in the session that filled the cache leaves later hits usable."""
+        _user_cache.pop(test_user.id, None)
+        async with TestingSessionLocal() as session:
+            await CachedUserDatabase(session, User).get(test_user.id)
+            await session.rollback()
+
+        async with TestingSessionLocal() as session:
+            user = await CachedUserDatabase(session, User).get(test_user.id)
+            assert user.is_active is True
+            assert user.email == test_user.email
+
+    async def test_deactivation_evicts_cached_user(self, async_client: AsyncClient, db_session: AsyncSession, test_user):
+        """Test that deactivating a cached user rejects their next request."""
+        headers = await self._login(async_client, test_user)
+        response = await async_client.get("/users/me", headers=headers)
+        assert response.status_code == status.HTTP_200_OK
+        assert test_user.id in _user_cache
+
+        user_db = CachedUserDatabase(db_session, User)
+        user = await user_db.get(test_user.id)
+        await user_db.update(user, {"is_active": False})
+        assert test_user.id not in _user_cache
+
+        response = await async_client.get("/users/me", headers=headers)
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
@@ -0,0 +1,90 @@
+"""
+Alembic migration tests against a populated SQLite database.
+"""
+import sqlite3
+import uuid
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session
+
+from src.core.database import DocumentMetadata, User
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _alembic_config(monkeypatch, db_path: Path) -> Config:
+    # env.py prefers DATABASE_URL over the ini setting
+    monkeypatch.setenv("DATABASE_URL", f"sqlite+aiosqlite:///{db_path}")
+    config = Config(str(PROJECT_ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(PROJECT_ROOT / "alembic"))
+    return config
+
+
+def _populate(db_path: Path, user_id: uuid.UUID, document_id: uuid.UUID) -> None:
+    conn = sqlite3.connect(db_path)
+    conn.execute(
+        "INSERT INTO users (id, email, hashed_password, is_active, is_superuser, is_verified) "
+        "VALUES (?, 'migrated@example.com', 'hashed', 1, 0, 0)",
+        (str(user_id),),
+    )
+    conn.execute(
+        "INSERT INTO documents (id, user_id, filename, original_size, chunks_count, file_hash) "
+        "VALUES (?, ?, 'notes.txt', 10, 1, 'abc123')",
+        (str(document_id), str(user_id)),
+    )
+    conn.commit()
+    conn.close()
+
+
+class TestUUIDBlobMigration:
+    """Test migration 004 converting UUID columns to 16-byte blobs."""
+
+    def test_upgrade_converts_existing_ids(self, monkeypatch, tmp_path):
+        """Test that existing text ids become 16-byte blobs the models can read back."""
+        db_path = tmp_path / "migrate.db"
+        config = _alembic_config(monkeypatch, db_path)
+        user_id, document_id = uuid.uuid4(), uuid.uuid4()
+
+        command.upgrade(config, "003")
+        _populate(db_path, user_id, document_id)
+        command.upgrade(config, "004")
+
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT typeof(id), id FROM users").fetchall() == [("blob", user_id.bytes)]
+        assert conn.execute("SELECT id, user_id FROM documents").fetchall() == [
+            (document_id.bytes, user_id.bytes)
+        ]
+        conn.close()
+
+        engine = create_engine(f"sqlite:///{db_path}")
+        try:
+            with Session(engine) as session:
+                user = session.get(User, user_id)
+                assert user is not None
+                assert user.email == "migrated@example.com"
+                document = session.get(DocumentMetadata, document_id)
+                assert document is not None
+                assert document.user_id == user_id
+        finally:
+            engine.dispose()
+
+    def test_downgrade_restores_text_ids(self, monkeypatch, tmp_path):
+        """Test that downgrading turns the blobs back into 36-char strings."""
+        db_path = tmp_path / "migrate.db"
+        config = _alembic_config(monkeypatch, db_path)
+        user_id, document_id = uuid.uuid4(), uuid.uuid4()
+
+        command.upgrade(config, "003")
+        _populate(db_path, user_id, document_id)
+        command.upgrade(config, "004")
+        command.downgrade(config, "003")
+
+        conn = sqlite3.connect(db_path)
+        assert conn.execute("SELECT typeof(id), id FROM users").fetchall() == [("text", str(user_id))]
+        assert conn.execute("SELECT id, user_id FROM documents").fetchall() == [
+            (str(document_id), str(user_id))
+        ]
+        conn.close()
@@ -0,0 +1,86 @@
+"""
+Tests for the per-user semantic answer cache.
+"""
+import uuid
+from unittest.mock import patch
+
+from src.core.semantic_cache import SemanticCache, get_user_cache, invalidate_user_cache
+
+
+class TestSemanticCache:
+    """Test similarity matching, expiry and eviction of cached answers."""
+
+    def test_similar_query_hits(self):
+        """Test that a query above the threshold returns the cached answer."""
+        cache = SemanticCache(max_entries=4, threshold=0.95, ttl_seconds=60)
+        cache.put([1.0, 0.0, 0.0], "answer")
+
+        assert cache.get([1.0, 0.01, 0.0]) == "answer"
+
+    def test_dissimilar_query_misses(self):
+        """Test that a query below the threshold is not answered from the cache."""
+        cache = SemanticCache(max_entries=4, threshold=0.95, ttl_seconds=60)
+        cache.put([1.0, 0.0, 0.0], "answer")
+
+        assert cache.get([0.0, 1.0, 0.0]) is None
+        assert cache.get([1.0, 1.0, 0.0]) is None
+
+    def test_empty_cache_misses(self):
+        """Test that lookups on an empty cache return nothing."""
+        assert SemanticCache(max_entries=4).get([1.0, 0.0]) is None
+
+    def test_entries_expire(self):
+        """Test that an answer is not returned once its TTL has passed."""
+        cache = SemanticCache(max_entries=4, threshold=0.95, ttl_seconds=10)
+        with patch("src.core.semantic_cache.time.monotonic", return_value=100.0):
+            cache.put([1.0, 0.0], "answer")
+        with patch("src.core.semantic_cache.time.monotonic", return_value=109.0):
+            assert cache.get([1.0, 0.0]) == "answer"
+        with patch("src.core.semantic_cache.time.monotonic", return_value=111.0):
+            assert cache.get([1.0, 0.0]) is None
+
+    def test_expired_best_match_does_not_hide_live_match(self):
+        """Test that an expired closer entry yields to a live entry above the threshold."""
+        cache = SemanticCache(max_entries=4, threshold=0.95, ttl_seconds=10)
+        with patch("src.core.semantic_cache.time.monotonic", return_value=0.0):
+            cache.put([1.0, 0.0], "stale")
+        with patch("src.core.semantic_cache.time.monotonic", return_value=20.0):
+            cache.put([1.0, 0.2], "fresh")
+        with patch("src.core.semantic_cache.time.monotonic", return_value=21.0):
+            assert cache.get([1.0, 0.0]) == "fresh"
+
+    def test_oldest_entry_replaced_when_full(self):
+        """Test that puts wrap around and overwrite the oldest entry."""
+        cache = SemanticCache(max_entries=2, threshold=0.95, ttl_seconds=60)
+        cache.put([1.0, 0.0, 0.0], "first")
+        cache.put([0.0, 1.0, 0.0], "second")
+        cache.put([0.0, 0.0, 1.0], "third")
+
+        assert cache.get([1.0, 0.0, 0.0]) is None
+        assert cache.get([0.0, 1.0, 0.0]) == "second"
+        assert cache.get([0.0, 0.0, 1.0]) == "third"
+
+
+class TestUserCaches:
+    """Test that answer caches are per user and can be invalidated."""
+
+    def test_users_do_not_share_answers(self):
+        """Test that one user's cached answer is not returned to another user."""
+        alice, bob = uuid.uuid4(), uuid.uuid4()
+        get_user_cache(alice).put([1.0, 0.0], "alice's answer")
+
+        assert get_user_cache(alice) is get_user_cache(alice)
+        assert get_user_cache(alice).get([1.0, 0.0]) == "alice's answer"
+        assert get_user_cache(bob).get([1.0, 0.0]) is None
+
+    def test_invalidate_drops_cached_answers(self):
+        """Test that invalidating a user's cache discards their answers only."""
+        user_id, other_id = uuid.uuid4(), uuid.uuid4()
+        get_user_cache(user_id).put([1.0, 0.0], "answer")
+        get_user_cache(other_id).put([1.0, 0.0], "other answer")
+
+        invalidate_user_cache(user_id)
+
+        assert get_user_cache(user_id).get([1.0, 0.0]) is None
+        assert get_user_cache(other_id).get([1.0, 0.0]) == "other answer"
+        invalidate_user_cache(uuid.uuid4())  # unknown users are a no-op
@@ -0,0 +1,166 @@
+"""
+Tests for the chunk storage pipeline: duplicate lookup, embedding and upserts.
+Qdrant is replaced by a mock client, so no server is needed.
+"""
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+
+from src.core.vector_store import (
+    UPSERT_BATCH_SIZE,
+    chunk_hash,
+    find_existing_hashes,
+    make_point_id,
+    upsert_vectors,
+)
+from src.main import embed_and_store_chunks
+
+
+def _point(digest: str) -> SimpleNamespace:
+    return SimpleNamespace(payload={"hash": digest})
+
+
+def _fake_encode(model, texts):
+    # Each vector records its own text, so pairing can be checked after upsert
+    return np.array([[len(text), ord(text[0])] for text in texts], dtype=np.float32)
+
+
+def _upserted_points(client: MagicMock) -> list:
+    points = []
+    for call in client.upsert.call_args_list:
+        batch = call.kwargs["points"]
+        points.extend(zip(batch.ids, batch.vectors, batch.payloads))
+    return points
+
+
+class TestFindExistingHashes:
+    """Test the lookup of chunk hashes already stored in a collection."""
+
+    def test_follows_scroll_offset_across_pages(self):
+        """Test that hashes on later scroll pages are still reported."""
+        client = MagicMock()
+        client.scroll.side_effect = [
+            ([_point("h1"), _point("h1")], "page-2"),
+            ([_point("h2")], None),
+        ]
+
+        found = find_existing_hashes(client, "user_col", ["h1", "h2", "h3"])
+
+        assert found == {"h1", "h2"}
+        assert client.scroll.call_count == 2
+        assert client.scroll.call_args_list[0].kwargs["offset"] is None
+        assert client.scroll.call_args_list[1].kwargs["offset"] == "page-2"
+
+    def test_stops_once_every_hash_is_found(self):
+        """Test that no further pages are fetched after all hashes were seen."""
+        client = MagicMock()
+        client.scroll.return_value = ([_point("h1"), _point("h2")], "page-2")
+
+        found = find_existing_hashes(client, "user_col", ["h1", "h2", "h1"])
+
+        assert found == {"h1", "h2"}
+        client.scroll.assert_called_once()
+        assert client.scroll.call_args.kwargs["limit"] == 2
+
+    def test_no_hashes_skips_lookup(self):
+        """Test that an empty hash list does not query Qdrant."""
+        client = MagicMock()
+
+        assert find_existing_hashes(client, "user_col", []) == set()
+        client.scroll.assert_not_called()
+
+
+class TestUpsertVectors:
+    """Test that upserts are batched and only the last request waits."""
+
+    def test_batches_keep_ids_vectors_and_payloads_aligned(self):
+        """Test that each request carries matching ids, vectors and payloads."""
+        client = MagicMock()
+        total = UPSERT_BATCH_SIZE * 2 + 5
+        vectors = np.arange(total, dtype=np.float32).reshape(total, 1)
+        ids = [f"id-{i}" for i in range(total)]
+        payloads = [{"n": i} for i in range(total)]
+
+        upsert_vectors(client, "user_col", vectors, payloads, ids=ids, wait=True)
+
+        assert client.upsert.call_count == 3
+        assert [call.kwargs["wait"] for call in client.upsert.call_args_list] == [False, False, True]
+        for point_id, vector, payload in _upserted_points(client):
+            assert point_id == f"id-{payload['n']}"
+            assert vector == [float(payload["n"])]
+
+    def test_no_request_waits_by_default(self):
+        """Test that wait=False leaves every request asynchronous."""
+        client = MagicMock()
+        vectors = np.zeros((UPSERT_BATCH_SIZE + 1, 2), dtype=np.float32)
+
+        upsert_vectors(client, "user_col", vectors, [{}] * len(vectors))
+
+        assert [call.kwargs["wait"] for call in client.upsert.call_args_list] == [False, False]
+
+
+class TestEmbedAndStoreChunks:
+    """Test deduplication and pairing in embed_and_store_chunks."""
+
+    async def test_skips_stored_and_repeated_chunks(self):
+        """Test that chunks already in the collection or repeated in the document are not stored."""
+        chunks = ["aaaaa", "bb", "ccccccccc", "bb", "dddddddd", "e"]
+        client = MagicMock()
+        client.scroll.return_value = ([_point(chunk_hash("ccccccccc"))], None)
+
+        with patch("src.main.qdrant_client", client), \
+             patch("src.main.encode_texts", side_effect=_fake_encode), \
+             patch("src.main.EMBED_BATCH_SIZE", 2):
+            stored = await embed_and_store_chunks("user_col", chunks, "doc.txt", "user-1")
+
+        assert stored == 4
+        texts = [payload["text"] for _, _, payload in _upserted_points(client)]
+        assert sorted(texts) == ["aaaaa", "bb", "dddddddd", "e"]
+
+    async def test_ids_and_payloads_stay_paired_after_length_sort(self):
+        """Test that every point keeps the id and vector of its own chunk."""
+        chunks = ["short", "a much longer chunk of text", "mid length", "x"]
+        client = MagicMock()
+        client.scroll.return_value = ([], None)
+
+        with patch("src.main.qdrant_client", client), \
+             patch("src.main.encode_texts", side_effect=_fake_encode), \
+             patch("src.main.EMBED_BATCH_SIZE", 2):
+            await embed_and_store_chunks("user_col", chunks, "doc.txt", "user-1")
+
+        points = _upserted_points(client)
+        assert len(points) == len(chunks)
+        for point_id, vector, payload in points:
+            text = payload["text"]
+            digest = chunk_hash(text)
+            assert payload["hash"] == digest
+            assert payload["source"] == "doc.txt"
+            assert point_id == make_point_id("doc.txt", chunks.index(text), digest)
+            assert vector == [float(len(text)), float(ord(text[0]))]
+
+    async def test_only_last_batch_waits(self):
+        """Test that the document is searchable on return without waiting on every batch."""
+        chunks = [f"chunk number {i}" for i in range(5)]
+        client = MagicMock()
+        client.scroll.return_value = ([], None)
+
+        with patch("src.main.qdrant_client", client), \
+             patch("src.main.encode_texts", side_effect=_fake_encode), \
+             patch("src.main.EMBED_BATCH_SIZE", 2):
+            await embed_and_store_chunks("user_col", chunks, "doc.txt", "user-1")
+
+        assert [call.kwargs["wait"] for call in client.upsert.call_args_list] == [False, False, True]
+
+    async def test_stores_all_chunks_when_lookup_fails(self):
+        """Test that a failed duplicate lookup falls back to storing every chunk."""
+        chunks = ["one", "two"]
+        client = MagicMock()
+        client.scroll.side_effect = RuntimeError("qdrant unavailable")
+
+        with patch("src.main.qdrant_client", client), \
+             patch("src.main.encode_texts", side_effect=_fake_encode):
+            stored = await embed_and_store_chunks("user_col", chunks, "doc.txt", "user-1")
+
+        assert stored == 2
+        assert len(_upserted_points(client)) == 2